@@ -1,84 +1,254 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
+import re
+import csv
+import hashlib
+import tempfile
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pandas.tseries.api import guess_datetime_format
+
+try:
+    import ahocorasick
+except ImportError:  # optional; fall back to the regex matcher
+    ahocorasick = None
+
+try:
+    import polars as pl
+except ImportError:  # optional; only needed for engine='polars'
+    pl = None
+
+# Mapping of potential column variations
+COLUMN_MAPPING = {
+    'Date': ['Date', 'Transaction Date', 'Posted Date'],
+    'Description': ['Description', 'Original Description'],
+    'Amount': ['Amount', 'Transaction Amount']
+}
+
+# Comprehensive category mapping for transactions
+CATEGORY_MAPPING = {
+    # Business Expenses - Plane Connection LLC
+    'PLANE CONNECTION': 'Business',
+    'PLANE CONNECTION LLC': 'Business',
+    'PLANE CONNECT': 'Business',
+    'TITAN AVIATION': 'Business',
+    'ADP FEES': 'Business',
+    'PAYROLL': 'Business',
+    
+    # Business Expenses - Lumis
+    'LUMIS': 'Business',
+    'LUMIS INC': 'Business',
+    
+    # Law School Expenses (New Hampshire specific)
+    'LAW SCHOOL': 'Law School',
+    'BARBRI': 'Law School',
+    'BAR EXAM': 'Law School',
+    'LEGAL EDUCATION': 'Law School',
+    'WESTLAW': 'Law School',
+    'LEXIS': 'Law School',
+    
+    # Homeschool Expenses
+    'HOMESCHOOL': 'Homeschool',
+    'CURRICULUM': 'Homeschool',
+    'EDUCATIONAL': 'Homeschool',
+    'BOOKS & SUPPLIES': 'Homeschool',
+    
+    # Subscription Services
+    'ADOBE': 'Subscription',
+    'AMAZON PRIME': 'Subscription',
+    'NETFLIX': 'Subscription',
+    'HULU': 'Subscription',
+    'SPOTIFY': 'Subscription',
+    
+    # Personal Expenses
+    'GROCERIES': 'Personal',
+    'RESTAURANTS': 'Personal',
+    'ENTERTAINMENT': 'Personal',
+    'SHOPPING': 'Personal',
+    'UTILITIES': 'Personal',
+    
+    # Financial Transactions
+    'CREDIT CARD PAYMENT': 'Financial',
+    'TRANSFER': 'Financial',
+    'PAYCHECK': 'Income',
+    'INTEREST INCOME': 'Income'
+}
+
+# Keyword matchers; later keywords take priority, as before, and the
+# New Hampshire rule outranks them all
+_KEYWORDS = list(CATEGORY_MAPPING.items()) + [('NH', 'Law School'), ('NEW HAMPSHIRE', 'Law School')]
+_KEYWORD_RANK = {keyword: i for i, (keyword, _) in enumerate(_KEYWORDS)}
+_CATEGORY_ARR = np.array([category for _, category in _KEYWORDS] + ['Uncategorized'])
+_KEYWORD_RE = re.compile("(?=({}))".format("|".join(re.escape(k) for k, _ in reversed(_KEYWORDS))))
+_CATEGORY_DTYPE = pd.CategoricalDtype(
+    sorted(set(CATEGORY_MAPPING.values()) | {'Uncategorized', 'Law School', 'Income', 'Financial'})
+)
+
+# Fixed schema of the streaming spool, so every file's segment matches
+# regardless of which standard columns that file actually had
+_SPOOL_SCHEMA = pa.schema([
+    pa.field('Date', pa.timestamp('us')),
+    pa.field('Description', pa.string()),
+    pa.field('Amount_Cents', pa.int64()),
+    pa.field('Source_File', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('Category', pa.dictionary(pa.int8(), pa.string()))
+])
+
+# Strings read as missing values by every CSV reader (pandas' read_csv
+# defaults: Arrow's plus '<NA>' and 'None'), so the pandas, chunked and
+# Polars paths agree on blank and N/A fields
+_NULL_VALUES = pacsv.ConvertOptions().null_values + ['<NA>', 'None']
+
+def _build_automaton():
+    """
+    Compile the ranked keywords into an Aho-Corasick automaton, if available
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, rank in _KEYWORD_RANK.items():
+        automaton.add_word(keyword, rank)
+    automaton.make_automaton()
+    return automaton
+
+_AUTOMATON = _build_automaton()
 
 class FinancialReportGenerator:
-    def __init__(self):
+    def __init__(self, cache_dir='.cache'):
         self.data = None
-        self.category_mapping = self._create_category_mapping()
+        self.cache_dir = cache_dir
+        self._stream = None
+        self._spool_dir = None
+        self._pl_data = None
+        
+        # Keyword matchers are built once at import time and shared
+        self.category_mapping = CATEGORY_MAPPING
+        self._keywords = _KEYWORDS
+        self._keyword_rank = _KEYWORD_RANK
+        self._category_arr = _CATEGORY_ARR
+        self._keyword_re = _KEYWORD_RE
+        self._automaton = _AUTOMATON
+        self._category_dtype = _CATEGORY_DTYPE
     
-    def _create_category_mapping(self):
+    def load_financial_data(self, file_paths, chunksize=None, engine='pandas'):
         """
-        Create a comprehensive category mapping for transactions
+        Load financial data from multiple CSV files
+        
+        Parameters:
+        file_paths (list): List of paths to CSV files
+        chunksize (int, optional): Stream files in chunks of this many rows,
+            keeping only running totals in memory
+        engine (str, optional): 'pandas' or 'polars' for the in-memory path
         """
-        return {
-            # Business Expenses - Plane Connection LLC
-            'PLANE CONNECTION': 'Business',
-            'PLANE CONNECTION LLC': 'Business',
-            'PLANE CONNECT': 'Business',
-            'TITAN AVIATION': 'Business',
-            'ADP FEES': 'Business',
-            'PAYROLL': 'Business',
-            
-            # Business Expenses - Lumis
-            'LUMIS': 'Business',
-            'LUMIS INC': 'Business',
-            
-            # Law School Expenses (New Hampshire specific)
-            'LAW SCHOOL': 'Law School',
-            'BARBRI': 'Law School',
-            'BAR EXAM': 'Law School',
-            'LEGAL EDUCATION': 'Law School',
-            'WESTLAW': 'Law School',
-            'LEXIS': 'Law School',
-            
-            # Homeschool Expenses
-            'HOMESCHOOL': 'Homeschool',
-            'CURRICULUM': 'Homeschool',
-            'EDUCATIONAL': 'Homeschool',
-            'BOOKS & SUPPLIES': 'Homeschool',
+        if chunksize:
+            self._stream_financial_data(file_paths, chunksize)
+            return
+        if engine == 'polars':
+            self._load_with_polars(file_paths)
+            return
+        if engine != 'pandas':
+            raise ValueError(f"Unknown engine: {engine}")
+        
+        all_data = []
+        source_dtype = self._source_file_dtype(file_paths)
+        
+        # Parse files concurrently; the Arrow reader releases the GIL
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(self._load_one, file_path, source_dtype) for file_path in file_paths]
             
-            # Subscription Services
-            'ADOBE': 'Subscription',
-            'AMAZON PRIME': 'Subscription',
-            'NETFLIX': 'Subscription',
-            'HULU': 'Subscription',
-            'SPOTIFY': 'Subscription',
+            for file_path, future in zip(file_paths, futures):
+                try:
+                    df = future.result()
+                    all_data.append(df)
+                    print(f"Loaded {file_path} with {len(df)} transactions")
+                
+                except Exception as e:
+                    print(f"Error loading {file_path}: {str(e)}")
+        
+        # Combine all data
+        if all_data:
+            self.data = pd.concat(all_data, ignore_index=True)
+            self.close()
+            self._pl_data = None
             
-            # Personal Expenses
-            'GROCERIES': 'Personal',
-            'RESTAURANTS': 'Personal',
-            'ENTERTAINMENT': 'Personal',
-            'SHOPPING': 'Personal',
-            'UTILITIES': 'Personal',
+            # Categorize transactions
+            self._categorize_transactions(self.data)
             
-            # Financial Transactions
-            'CREDIT CARD PAYMENT': 'Financial',
-            'TRANSFER': 'Financial',
-            'PAYCHECK': 'Income',
-            'INTEREST INCOME': 'Income'
-        }
+            print(f"Total transactions loaded: {len(self.data)}")
+        else:
+            print("No data was loaded.")
     
-    def load_financial_data(self, file_paths):
+    def _load_one(self, file_path, source_dtype):
         """
-        Load financial data from multiple CSV files
+        Read and standardize a single CSV file
+        """
+        # Read CSV file (or its cached Feather copy)
+        df = self._read_statement(file_path)
         
-        Parameters:
-        file_paths (list): List of paths to CSV files
+        # Standardize column names; only the standard columns are kept, in a
+        # fixed order, as in the chunked and Polars paths
+        df = self._standardize_columns(df)[['Date', 'Description', 'Amount_Cents']]
+        
+        # Add source file information
+        df['Source_File'] = self._source_file_column(file_path, len(df), source_dtype)
+        
+        return df
+    
+    def _source_file_dtype(self, file_paths):
+        """
+        Categorical dtype over the file names, so Source_File stores one code per row
+        """
+        return pd.CategoricalDtype(list(dict.fromkeys(os.path.basename(path) for path in file_paths)))
+    
+    def _source_file_column(self, file_path, length, source_dtype):
+        """
+        Build a Source_File column of the given length for one file
         """
+        code = source_dtype.categories.get_loc(os.path.basename(file_path))
+        return pd.Categorical.from_codes(np.full(length, code), dtype=source_dtype)
+    
+    def _load_with_polars(self, file_paths):
+        """
+        Load and categorize CSV files with Polars, converting to pandas at the end
+        
+        The Polars frame is kept so generate_tax_reports can aggregate in Polars too.
+        """
+        if pl is None:
+            raise ImportError("engine='polars' requires the polars package")
+        
         all_data = []
+        source_enum = pl.Enum(list(self._source_file_dtype(file_paths).categories))
         
         for file_path in file_paths:
             try:
-                # Read CSV file
-                df = pd.read_csv(file_path)
+                columns = self._resolve_columns(file_path)
+                schema = {col: pl.String if std_col != 'Amount' else pl.Float64 for col, std_col in columns.items()}
+                # With no standard column the first column is read anyway, so the
+                # file keeps its row count (as Uncategorized rows) like with pandas
+                selection = [pl.col(col).alias(std_col) for col, std_col in columns.items()] or [pl.first()]
+                df = (
+                    pl.scan_csv(file_path, schema_overrides=schema, infer_schema=False, null_values=_NULL_VALUES)
+                    .select(selection)
+                    .collect(engine='streaming')
+                )
                 
-                # Standardize column names
-                df = self._standardize_columns(df)
+                # Ensure standard columns exist
+                missing = {'Date': pl.String, 'Description': pl.String, 'Amount': pl.Float64}
+                df = df.with_columns([pl.lit(None, dtype=dtype).alias(col) for col, dtype in missing.items()
+                                      if col not in df.columns])
                 
-                # Add source file information
-                df['Source_File'] = os.path.basename(file_path)
+                df = df.select(
+                    self._parse_polars_dates(df['Date']).alias('Date'),
+                    pl.col('Description'),
+                    (pl.col('Amount') * 100).round().cast(pl.Int64).alias('Amount_Cents'),
+                    pl.lit(os.path.basename(file_path)).cast(source_enum).alias('Source_File')
+                )
                 
                 all_data.append(df)
                 print(f"Loaded {file_path} with {len(df)} transactions")
@@ -86,36 +256,278 @@ class FinancialReportGenerator:
             except Exception as e:
                 print(f"Error loading {file_path}: {str(e)}")
         
-        # Combine all data
-        if all_data:
-            self.data = pd.concat(all_data, ignore_index=True)
-            
-            # Convert Date column to datetime
-            self.data['Date'] = pd.to_datetime(self.data['Date'], errors='coerce')
-            
-            # Sort by date
-            self.data.sort_values('Date', inplace=True)
-            
-            # Categorize transactions
-            self._categorize_transactions()
+        if not all_data:
+            print("No data was loaded.")
+            return
+        
+        # Keyword rules as nested when/then, each later keyword overriding the earlier ones
+        desc_upper = pl.col('Description').fill_null('').str.to_uppercase()
+        category = pl.lit('Uncategorized')
+        for keyword, label in self._keywords:
+            category = pl.when(desc_upper.str.contains(keyword, literal=True)).then(pl.lit(label)).otherwise(category)
+        category_enum = pl.Enum(list(self._category_dtype.categories))
+        
+        self._pl_data = (
+            pl.concat(all_data)
+            .lazy()
+            .with_columns(category.cast(category_enum).alias('Category'))
+            .collect(engine='streaming')
+        )
+        self.close()
+        
+        # pandas boundary for the report writers
+        self.data = self._pl_data.to_pandas()
+        self.data['Category'] = self.data['Category'].astype(self._category_dtype)
+        
+        print(f"Total transactions loaded: {len(self.data)}")
+    
+    def _parse_polars_dates(self, dates):
+        """
+        Polars counterpart of _parse_dates, with the same formats and fallback
+        
+        Values must fully match YYYY-MM-DD or MM/DD/YYYY; if any value does
+        not, the whole column goes through pd.to_datetime instead.
+        """
+        parsed = pl.select(pl.coalesce(
+            pl.when(dates.str.contains(r'^\d{4}-\d{1,2}-\d{1,2}$')).then(dates.str.to_datetime('%Y-%m-%d', strict=False)),
+            pl.when(dates.str.contains(r'^\d{1,2}/\d{1,2}/\d{4}$')).then(dates.str.to_datetime('%m/%d/%Y', strict=False))
+        )).to_series()
+        
+        if (parsed.is_null() & dates.is_not_null()).any():
+            parsed = pl.from_pandas(pd.to_datetime(dates.to_pandas(), errors='coerce'))
+        return parsed
+    
+    def _stream_financial_data(self, file_paths, chunksize):
+        """
+        Categorize and pre-aggregate CSV files chunk by chunk
+        
+        The detailed log and the business rows are spooled to temporary Parquet
+        files, so memory use is bounded by the chunk size plus the running totals.
+        """
+        # The spool holds every transaction, so it lives in a private temporary
+        # directory that is removed by close(), by the next load, or on exit
+        self.close()
+        self._spool_dir = tempfile.TemporaryDirectory(prefix='transaction_log_')
+        
+        source_dtype = self._source_file_dtype(file_paths)
+        
+        self.data = None
+        self._pl_data = None
+        self._stream = self._new_totals()
+        
+        for i, file_path in enumerate(file_paths):
+            # Each file gets its own totals and spool segments, merged into the
+            # stream only once the whole file has been read
+            totals = self._new_totals(os.path.join(self._spool_dir.name, f'segment_{i}'))
+            try:
+                columns = self._resolve_columns(file_path)
+                dtypes = {col: 'float64' if std_col == 'Amount' else 'str' for col, std_col in columns.items()}
+                date_col = next((col for col, std_col in columns.items() if std_col == 'Date'), None)
+                date_fallback = self._scan_dates(file_path, date_col, chunksize) if date_col else False
+                
+                rows = 0
+                with pd.read_csv(file_path, usecols=list(columns) or None, dtype=dtypes, chunksize=chunksize,
+                                 keep_default_na=False, na_values=_NULL_VALUES) as reader:
+                    for chunk in reader:
+                        chunk = self._standardize_columns(chunk, date_fallback)[['Date', 'Description', 'Amount_Cents']]
+                        chunk['Source_File'] = self._source_file_column(file_path, len(chunk), source_dtype)
+                        self._accumulate(chunk, totals)
+                        rows += len(chunk)
+                self._close_spools(totals)
+                self._merge_totals(totals)
+                print(f"Loaded {file_path} with {rows} transactions")
             
-            print(f"Total transactions loaded: {len(self.data)}")
+            except Exception as e:
+                self._close_spools(totals, discard=True)
+                print(f"Error loading {file_path}: {str(e)}")
+        
+        if self._stream['spools']['log']['segments']:
+            print(f"Total transactions loaded: {self._stream['rows']}")
         else:
+            self.close()
             print("No data was loaded.")
     
-    def _standardize_columns(self, df):
+    def close(self):
         """
-        Standardize column names across different file types
+        Discard streaming totals and delete the temporary transaction log spool
+        """
+        self._stream = None
+        if self._spool_dir is not None:
+            self._spool_dir.cleanup()
+            self._spool_dir = None
+    
+    def _scan_dates(self, file_path, date_col, chunksize):
+        """
+        Decide a file's date fallback (see _parse_dates) before it is streamed
+        
+        Only the date column is read, so every chunk of the file is then parsed
+        the way the whole column would be in memory.
+        """
+        head = None
+        with pd.read_csv(file_path, usecols=[date_col], dtype='str', chunksize=chunksize,
+                         keep_default_na=False, na_values=_NULL_VALUES) as reader:
+            for chunk in reader:
+                dates = chunk[date_col]
+                if head is None or not len(head):
+                    head = dates[dates.notna() & (dates != '')].iloc[:1]
+                if self._has_unparsed_dates(self._strict_dates(dates), dates):
+                    return self._fallback_format(head)
+        return False
+    
+    def _new_totals(self, spool_prefix=None):
+        """
+        Empty running totals for the streaming path
+        
+        A file's totals get a spool_prefix for their detailed log and business
+        spool segments; the stream collects the segments of every loaded file.
+        """
+        spools = {}
+        for name in ('log', 'business'):
+            spools[name] = {
+                'segments': [f'{spool_prefix}_{name}.parquet'] if spool_prefix else [],
+                'writer': None,
+                'csv_date_types': [pa.date32(), pa.timestamp('s')]
+            }
+        return {'monthly': {}, 'spools': spools, 'dates': [], 'rows': 0}
+    
+    def _close_spools(self, totals, discard=False):
+        """
+        Close a file's spool writers, deleting the segments if the file failed
+        """
+        for spool in totals['spools'].values():
+            if spool['writer'] is not None:
+                spool['writer'].close()
+            if discard:
+                for path in spool['segments']:
+                    if os.path.exists(path):
+                        os.remove(path)
+    
+    def _merge_totals(self, totals):
+        """
+        Fold the totals of one fully read file into the stream
+        """
+        stream = self._stream
+        for key, (total, count) in totals['monthly'].items():
+            entry = stream['monthly'].setdefault(key, [0, 0])
+            entry[0] += total
+            entry[1] += count
+        for name, spool in totals['spools'].items():
+            if spool['writer'] is not None:
+                merged = stream['spools'][name]
+                merged['segments'].extend(spool['segments'])
+                merged['csv_date_types'] = [t for t in merged['csv_date_types'] if t in spool['csv_date_types']]
+        stream['dates'].extend(totals['dates'])
+        stream['rows'] += totals['rows']
+    
+    def _accumulate(self, chunk, totals):
         """
-        # Mapping of potential column variations
-        column_mapping = {
-            'Date': ['Date', 'Transaction Date', 'Posted Date'],
-            'Description': ['Description', 'Original Description'],
-            'Amount': ['Amount', 'Transaction Amount']
-        }
+        Fold one chunk of transactions into a file's running totals
+        """
+        self._categorize_transactions(chunk)
+        self._spool(totals['spools']['log'], chunk)
+        self._spool(totals['spools']['business'], self._business_rows(chunk))
+        
+        # Running (Month, Category) totals; the category summary is rolled up from these
+        chunk['Month'] = self._month_index(chunk['Date'])
+        grouped = chunk.groupby(['Month', 'Category'], observed=True, dropna=False, sort=False)['Amount_Cents'].agg(
+            Total_Cents='sum',
+            Transaction_Count='count'
+        )
+        for key, total, count in zip(grouped.index, grouped['Total_Cents'], grouped['Transaction_Count']):
+            entry = totals['monthly'].setdefault(key, [0, 0])
+            entry[0] += total
+            entry[1] += count
         
+        totals['dates'].extend([chunk['Date'].min(), chunk['Date'].max()])
+        totals['rows'] += len(chunk)
+    
+    def _spool(self, spool, df):
+        """
+        Append transactions to a spool segment as one date-sorted row group
+        
+        Every row group is then a sorted run for _sorted_spool_batches to merge.
+        """
+        table = pa.Table.from_pandas(df.sort_values('Date', kind='stable'), schema=_SPOOL_SCHEMA, preserve_index=False)
+        if spool['writer'] is None:
+            spool['writer'] = pq.ParquetWriter(spool['segments'][0], _SPOOL_SCHEMA)
+        spool['writer'].write_table(table)
+        spool['csv_date_types'] = self._csv_date_types(table.column('Date'), spool['csv_date_types'])
+    
+    def _read_statement(self, file_path):
+        """
+        Read a statement CSV, reusing a Feather copy keyed on path, mtime and size
+        """
+        # Only the standard columns are read, with their types fixed up front
+        columns = self._resolve_columns(file_path)
+        
+        cache_path = None
+        if self.cache_dir:
+            stat = os.stat(file_path)
+            # 'raw-dates' marks entries that keep Date as unparsed strings, and
+            # 'null-strings' those that read blank and N/A strings as missing
+            key = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{','.join(columns)}|raw-dates|null-strings"
+            cache_path = os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.feather')
+            if os.path.exists(cache_path):
+                try:
+                    return pd.read_feather(cache_path)
+                except Exception as e:
+                    # Damaged entry: re-parse the CSV and overwrite it below
+                    print(f"Ignoring unreadable cache for {file_path}: {str(e)}")
+        
+        # Multithreaded Arrow parser; dates stay strings because Arrow's %Y also
+        # accepts two-digit years, and are parsed in _standardize_columns
+        column_types = {col: pa.float64() if std_col == 'Amount' else pa.string()
+                        for col, std_col in columns.items()}
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(columns),
+                column_types=column_types,
+                null_values=_NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+        
+        if cache_path:
+            tmp_path = None
+            try:
+                # Write to a private temp file and rename, so readers (including
+                # other loader threads) never see a partially written entry
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as fh:
+                    df.to_feather(fh, compression='zstd')
+                os.replace(tmp_path, cache_path)
+            except Exception as e:
+                print(f"Could not cache {file_path}: {str(e)}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        
+        return df
+    
+    def _resolve_columns(self, file_path):
+        """
+        Map the header columns of a CSV file to their standard names
+        """
+        with open(file_path, newline='', encoding='utf-8-sig') as fh:
+            header = next(csv.reader(fh), [])
+        
+        resolved = {}
+        for std_col, possible_cols in COLUMN_MAPPING.items():
+            for col in possible_cols:
+                if col in header:
+                    resolved[col] = std_col
+                    break
+        return resolved
+    
+    def _standardize_columns(self, df, date_fallback=None):
+        """
+        Standardize column names across different file types
+        """
         # Rename columns to standard format
-        for std_col, possible_cols in column_mapping.items():
+        for std_col, possible_cols in COLUMN_MAPPING.items():
             for col in possible_cols:
                 if col in df.columns:
                     df.rename(columns={col: std_col}, inplace=True)
@@ -126,69 +538,358 @@ class FinancialReportGenerator:
             if std_col not in df.columns:
                 df[std_col] = None
         
+        df['Date'] = self._parse_dates(df['Date'], date_fallback)
+        
+        # Amounts are kept as integer cents: exact sums, and cheaper to aggregate
+        df['Amount'] = (pd.to_numeric(df['Amount'], errors='coerce') * 100).round().astype('Int64')
+        df.rename(columns={'Amount': 'Amount_Cents'}, inplace=True)
+        
         return df
     
-    def _categorize_transactions(self):
+    def _parse_dates(self, dates, fallback=None):
+        """
+        Parse a file's date strings as YYYY-MM-DD or MM/DD/YYYY
+        
+        If any non-empty value matches neither format, the whole column is
+        parsed with the format pd.to_datetime infers from its first value
+        instead. Chunked reads pass the file's fallback from _scan_dates:
+        False for the two formats, or the pd.to_datetime format to use.
+        """
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+        
+        if not fallback:
+            parsed = self._strict_dates(dates)
+            if fallback is False or not self._has_unparsed_dates(parsed, dates):
+                return parsed
+            fallback = self._fallback_format(dates)
+        return pd.to_datetime(dates, format=fallback, errors='coerce')
+    
+    def _strict_dates(self, dates):
+        """
+        Parse date strings that fully match YYYY-MM-DD or MM/DD/YYYY
+        """
+        parsed = pd.to_datetime(dates, format='%Y-%m-%d', errors='coerce')
+        return parsed.fillna(pd.to_datetime(dates, format='%m/%d/%Y', errors='coerce'))
+    
+    def _has_unparsed_dates(self, parsed, dates):
+        """
+        Whether any non-empty date string was left unparsed
+        """
+        return bool((parsed.isna() & dates.notna() & (dates != '')).any())
+    
+    def _fallback_format(self, dates):
+        """
+        The format pd.to_datetime would infer from the first non-empty date,
+        or 'mixed' (parse each value on its own) when none can be inferred
+        """
+        values = dates[dates.notna() & (dates != '')]
+        return (guess_datetime_format(values.iloc[0]) if len(values) else None) or 'mixed'
+    
+    def _categorize_transactions(self, df):
         """
         Categorize transactions based on predefined mapping
         """
-        # Initialize category column
-        self.data['Category'] = 'Uncategorized'
+        # Classify each distinct description once, then broadcast by code
+        desc = df['Description'].fillna('').astype(str).astype('category')
+        cats_upper = pd.Series(desc.cat.categories.str.upper())
+        category_lookup = self._classify(cats_upper)
+        # Fixed categorical keys keep group-bys on small integer codes
+        df['Category'] = pd.Categorical(category_lookup[desc.cat.codes.to_numpy()], dtype=self._category_dtype)
+    
+    def _classify(self, desc_upper):
+        """
+        Map uppercased descriptions to categories (highest-priority keyword wins)
+        """
+        if self._automaton is not None:
+            # One Aho-Corasick scan per description, independent of keyword count
+            automaton = self._automaton
+            rank = np.fromiter(
+                (max((r for _, r in automaton.iter(desc)), default=-1) for desc in desc_upper),
+                dtype=np.intp, count=len(desc_upper)
+            )
+        else:
+            hits = desc_upper.str.findall(self._keyword_re)
+            rank = hits.map(lambda found: max((self._keyword_rank[k] for k in found), default=-1)).to_numpy(dtype=np.intp)
+        return self._category_arr[rank]
+    
+    def _write_csv(self, df, path):
+        """
+        Write a report frame with the multithreaded Arrow CSV writer
+        """
+        table = self._dates_for_csv(pa.Table.from_pandas(df, preserve_index=False))
+        with open(path, 'wb', buffering=4 * 1024 * 1024) as fh:
+            pacsv.write_csv(table, fh)
+    
+    def _dates_for_csv(self, table):
+        """
+        Narrow timestamp columns so CSVs show dates the same way on every engine
+        """
+        for i, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                target = (self._csv_date_types(table.column(i)) or [field.type])[0]
+                table = table.set_column(i, pa.field(field.name, target), pc.cast(table.column(i), target))
+        return table
+    
+    def _csv_date_types(self, dates, candidates=None):
+        """
+        Keep the CSV date types, narrowest first, that hold every value of a timestamp column
         
-        # Categorize based on description
-        for keyword, category in self.category_mapping.items():
-            mask = self.data['Description'].str.upper().str.contains(keyword, na=False)
-            self.data.loc[mask, 'Category'] = category
+        date32 writes YYYY-MM-DD and second timestamps write YYYY-MM-DD HH:MM:SS,
+        as pandas did; a column with sub-second values keeps its own type.
+        """
+        if candidates is None:
+            candidates = [pa.date32(), pa.timestamp('s')]
+        kept = []
+        for target in candidates:
+            narrowed = pc.cast(dates, target, safe=False)
+            if pc.all(pc.equal(pc.cast(narrowed, dates.type), dates)).as_py() is not False:
+                kept.append(target)
+        return kept
+    
+    def _write_parquet(self, df, path):
+        """
+        Write a report frame as zstd Parquet with dictionary-encoded columns
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, path, compression='zstd', use_dictionary=True)
+    
+    def _sorted_spool_batches(self, segments, batch_size=64 * 1024):
+        """
+        Yield spooled transactions in date order, a batch at a time
+        
+        Every row group of the spool is a date-sorted run; the runs are merged
+        holding roughly one batch per run in memory. Rows with equal dates keep
+        file order, matching the stable sort of the in-memory path.
+        """
+        undated = np.iinfo(np.int64).max  # undated rows sort last
+        runs = []
+        for path in segments:
+            segment = pq.ParquetFile(path)
+            for i in range(segment.num_row_groups):
+                runs.append({'batches': segment.iter_batches(batch_size=batch_size, row_groups=[i]),
+                             'table': None, 'keys': None, 'done': False})
+        
+        def refill(run):
+            batch = next(run['batches'], None)
+            if batch is None:
+                run['done'] = True
+                return
+            keys = pc.fill_null(pc.cast(batch.column('Date'), pa.int64()), undated).to_numpy()
+            table = pa.Table.from_batches([batch])
+            if run['table'] is None or run['table'].num_rows == 0:
+                run['table'], run['keys'] = table, keys
+            else:
+                run['table'] = pa.concat_tables([run['table'], table])
+                run['keys'] = np.concatenate([run['keys'], keys])
         
-        # Special rule for New Hampshire transactions
-        self.data.loc[self.data['Description'].str.contains('NH|NEW HAMPSHIRE', case=False, na=False), 'Category'] = 'Law School'
+        while True:
+            for run in runs:
+                if not run['done'] and (run['table'] is None or run['table'].num_rows == 0):
+                    refill(run)
+            live = [run for run in runs if run['table'] is not None and run['table'].num_rows]
+            if not live:
+                return
+            
+            # Rows below the smallest buffered tail of any unfinished run are final
+            open_runs = [run for run in live if not run['done']]
+            threshold = min((run['keys'][-1] for run in open_runs), default=None)
+            taken, taken_keys = [], []
+            for run in live:
+                n = run['table'].num_rows if threshold is None else int(np.searchsorted(run['keys'], threshold))
+                if n:
+                    taken.append(run['table'].slice(0, n))
+                    taken_keys.append(run['keys'][:n])
+                    run['table'], run['keys'] = run['table'].slice(n), run['keys'][n:]
+            
+            if not taken:
+                # Every buffer starts at the threshold date: read further into those runs
+                for run in open_runs:
+                    if run['keys'][-1] == threshold:
+                        refill(run)
+                continue
+            
+            order = np.argsort(np.concatenate(taken_keys), kind='stable')
+            yield from pa.concat_tables(taken).take(order).to_batches()
     
-    def generate_tax_reports(self, output_folder=None):
+    def _write_spool(self, name, path=None, csv_path=None):
+        """
+        Copy a streamed spool, in date order, to Parquet and/or CSV
+        
+        The business spool also gets the YYYY-MM Month column of the business
+        expense report.
+        """
+        spool = self._stream['spools'][name]
+        cents_idx = _SPOOL_SCHEMA.get_field_index('Amount_Cents')
+        schema = _SPOOL_SCHEMA.set(cents_idx, pa.field('Amount', pa.float64()))
+        if name == 'business':
+            schema = schema.append(pa.field('Month', pa.string()))
+        
+        # The CSV date type has to suit the whole spool, so it comes from the
+        # types every streamed chunk could be narrowed to
+        date_idx = schema.get_field_index('Date')
+        date_type = (spool['csv_date_types'] or [schema.field(date_idx).type])[0]
+        csv_schema = schema.set(date_idx, pa.field('Date', date_type))
+        
+        with contextlib.ExitStack() as stack:
+            writer = None
+            if path:
+                writer = stack.enter_context(pq.ParquetWriter(path, schema, compression='zstd', use_dictionary=True))
+            csv_writer = None
+            if csv_path:
+                fh = stack.enter_context(open(csv_path, 'wb', buffering=4 * 1024 * 1024))
+                csv_writer = stack.enter_context(pacsv.CSVWriter(fh, csv_schema))
+            
+            for batch in self._sorted_spool_batches(spool['segments']):
+                dollars = pc.divide(pc.cast(batch.column(cents_idx), pa.float64()), 100)
+                columns = batch.columns
+                columns[cents_idx] = dollars
+                if name == 'business':
+                    columns.append(pc.strftime(batch.column('Date'), format='%Y-%m'))
+                table = pa.Table.from_arrays(columns, schema=schema)
+                if writer is not None:
+                    writer.write_table(table)
+                if csv_writer is not None:
+                    csv_writer.write_table(table.set_column(date_idx, csv_schema.field(date_idx),
+                                                            pc.cast(table.column(date_idx), date_type)))
+    
+    def _business_rows(self, df):
+        """
+        Select Business transactions with an int8 compare on the category codes
+        """
+        business_code = self._category_dtype.categories.get_loc('Business')
+        return df[df['Category'].cat.codes.to_numpy() == business_code]
+    
+    def _month_index(self, dates):
+        """
+        Months since 1970-01 as nullable int32, a cheaper group key than periods
+        """
+        months = dates.to_numpy().astype('datetime64[M]')
+        codes = months.astype('int64').astype('int32')
+        return pd.Series(pd.arrays.IntegerArray(codes, np.isnat(months)), index=dates.index)
+    
+    def _format_months(self, months):
+        """
+        Render month indexes from _month_index as YYYY-MM strings
+        """
+        nat = np.iinfo('int64').min
+        dates = pd.Series(months.to_numpy(dtype='int64', na_value=nat).astype('datetime64[M]'), index=months.index)
+        return dates.dt.strftime('%Y-%m')
+    
+    def _cents_to_dollars(self, df, column, name):
+        """
+        Replace an integer cents column with its dollar value under a new name
+        """
+        return df.assign(**{column: df[column] / 100}).rename(columns={column: name})
+    
+    def generate_tax_reports(self, output_folder=None, detailed_log_csv=False):
         """
         Generate comprehensive tax reports
         
         Parameters:
         output_folder (str, optional): Folder to save reports
+        detailed_log_csv (bool, optional): Also write the detailed transaction
+            log as CSV next to the Parquet file
         """
         # Create output folder if not specified
         if output_folder is None:
             output_folder = f"tax_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         os.makedirs(output_folder, exist_ok=True)
         
-        # 1. Detailed Transaction Log
-        detailed_log = self.data.copy()
-        detailed_log.to_csv(os.path.join(output_folder, 'detailed_transaction_log.csv'), index=False)
-        
-        # 2. Category Summary
-        category_summary = self.data.groupby('Category').agg({
-            'Amount': ['count', 'sum']
-        }).reset_index()
-        category_summary.columns = ['Category', 'Transaction_Count', 'Total_Amount']
-        category_summary.to_csv(os.path.join(output_folder, 'category_summary.csv'), index=False)
-        
-        # 3. Monthly Breakdown
-        self.data['Month'] = self.data['Date'].dt.to_period('M')
-        monthly_breakdown = self.data.groupby(['Month', 'Category'])['Amount'].agg([
-            ('Total_Amount', 'sum'),
-            ('Transaction_Count', 'count')
-        ]).reset_index()
-        monthly_breakdown.to_csv(os.path.join(output_folder, 'monthly_breakdown.csv'), index=False)
+        if self._stream is None:
+            # 1. Detailed Transaction Log, the only report that needs date order
+            detailed_log = self._cents_to_dollars(self.data.sort_values('Date', kind='stable'), 'Amount_Cents', 'Amount')
+            self._write_parquet(detailed_log, os.path.join(output_folder, 'detailed_transaction_log.parquet'))
+            if detailed_log_csv:
+                self._write_csv(detailed_log, os.path.join(output_folder, 'detailed_transaction_log.csv'))
+            
+            # (Month, Category) totals: the only pass over the full table; undated
+            # rows are kept here so they still count towards the category summary
+            self.data['Month'] = self._month_index(self.data['Date'])
+            if self._pl_data is not None:
+                grouped = (
+                    self._pl_data
+                    .group_by(
+                        ((pl.col('Date').dt.year() - 1970) * 12 + pl.col('Date').dt.month() - 1).cast(pl.Int32).alias('Month'),
+                        'Category'
+                    )
+                    .agg(Total_Cents=pl.col('Amount_Cents').sum(), Transaction_Count=pl.col('Amount_Cents').count())
+                    .to_pandas()
+                )
+                grouped['Month'] = grouped['Month'].astype('Int32')
+                grouped['Category'] = grouped['Category'].astype(self._category_dtype)
+            else:
+                grouped = self.data.groupby(['Month', 'Category'], observed=True, dropna=False, sort=False)['Amount_Cents'].agg(
+                    Total_Cents='sum',
+                    Transaction_Count='count'
+                ).reset_index()
+            
+            date_min, date_max = self.data['Date'].min(), self.data['Date'].max()
+            total_transactions = len(self.data)
+        else:
+            # 1. Detailed Transaction Log, merged into date order from the spool
+            self._write_spool(
+                'log',
+                os.path.join(output_folder, 'detailed_transaction_log.parquet'),
+                os.path.join(output_folder, 'detailed_transaction_log.csv') if detailed_log_csv else None
+            )
+            
+            # (Month, Category) totals accumulated while streaming
+            grouped = pd.DataFrame(
+                [(month, category, total, count) for (month, category), (total, count) in self._stream['monthly'].items()],
+                columns=['Month', 'Category', 'Total_Cents', 'Transaction_Count']
+            )
+            grouped['Category'] = grouped['Category'].astype(self._category_dtype)
+            
+            dates = pd.Series(self._stream['dates'], dtype='datetime64[ns]')
+            date_min, date_max = dates.min(), dates.max()
+            total_transactions = self._stream['rows']
+        
+        # 2. Monthly Breakdown
+        monthly_breakdown = grouped[grouped['Month'].notna()].sort_values(['Month', 'Category'], ignore_index=True)
+        monthly_breakdown = self._cents_to_dollars(monthly_breakdown, 'Total_Cents', 'Total_Amount')
+        monthly_breakdown['Month'] = self._format_months(monthly_breakdown['Month'])
+        self._write_csv(monthly_breakdown, os.path.join(output_folder, 'monthly_breakdown.csv'))
+        
+        # 3. Category Summary, rolled up from the small grouped frame
+        category_summary = grouped.groupby('Category', observed=True, sort=False).agg(
+            Transaction_Count=('Transaction_Count', 'sum'),
+            Total_Cents=('Total_Cents', 'sum')
+        ).sort_index().reset_index()
+        category_summary = self._cents_to_dollars(category_summary, 'Total_Cents', 'Total_Amount')
+        self._write_csv(category_summary, os.path.join(output_folder, 'category_summary.csv'))
         
         # 4. Business Expense Detail
-        business_expenses = self.data[self.data['Category'] == 'Business']
-        business_expenses.to_csv(os.path.join(output_folder, 'business_expenses.csv'), index=False)
+        business_path = os.path.join(output_folder, 'business_expenses.csv')
+        if self._stream is None:
+            business_expenses = self._business_rows(self.data).sort_values('Date', kind='stable')
+            business_expenses = self._cents_to_dollars(business_expenses, 'Amount_Cents', 'Amount')
+            business_expenses['Month'] = self._format_months(business_expenses['Month'])
+            self._write_csv(business_expenses, business_path)
+        else:
+            # Merged into date order from the business spool
+            self._write_spool('business', csv_path=business_path)
         
         # 5. Tax Preparation Summary
+        # Built in full before opening the file, so it is written with one call
+        lines = [
+            "TAX PREPARATION SUMMARY\n",
+            "=======================\n\n",
+            f"Date Range: {date_min} to {date_max}\n",
+            f"Total Transactions: {total_transactions}\n\n",
+            "CATEGORY BREAKDOWN\n",
+            "------------------\n"
+        ]
+        lines.extend(
+            f"{category}: {count} transactions, ${amount:,.2f}\n"
+            for category, count, amount in zip(
+                category_summary['Category'],
+                category_summary['Transaction_Count'],
+                category_summary['Total_Amount']
+            )
+        )
         with open(os.path.join(output_folder, 'tax_summary.txt'), 'w') as f:
-            f.write("TAX PREPARATION SUMMARY\n")
-            f.write("=======================\n\n")
-            f.write(f"Date Range: {self.data['Date'].min()} to {self.data['Date'].max()}\n")
-            f.write(f"Total Transactions: {len(self.data)}\n\n")
-            
-            f.write("CATEGORY BREAKDOWN\n")
-            f.write("------------------\n")
-            for _, row in category_summary.iterrows():
-                f.write(f"{row['Category']}: {row['Transaction_Count']} transactions, ${row['Total_Amount']:,.2f}\n")
+            f.write(''.join(lines))
         
         print(f"Tax reports generated in {output_folder}")
         return output_folder